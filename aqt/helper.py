@@ -139,7 +139,7 @@ def downloadBinaryFile(url: str, out: Path, hash_algo: str, exp: Optional[bytes]
                 hash = hashlib.new(hash_algo)
             try:
                 with open(out, "wb") as fd:
-                    for chunk in r.iter_content(chunk_size=8196):
+                    for chunk in r.iter_content(chunk_size=1024 * 1024):
                         fd.write(chunk)
                         hash.update(chunk)
                     fd.flush()
@@ -173,10 +173,10 @@ def retry_on_errors(action: Callable[[], Any], acceptable_errors: Tuple, num_ret
 
 def retry_on_bad_connection(function: Callable[[str], Any], base_url: str) -> Any:
     logger = getLogger("aqt.helper")
-    fallback_url = secrets.choice(Settings.fallbacks)
     try:
         return function(base_url)
     except ArchiveConnectionError:
+        fallback_url = secrets.choice(Settings.fallbacks)
         logger.warning(f"Connection to '{base_url}' failed. Retrying with fallback '{fallback_url}'.")
         return function(fallback_url)
 
@@ -18,25 +18,23 @@
 # COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
 # IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
-import itertools
-import operator
 import os
 import posixpath
 import re
 import secrets as random
 import shutil
 from abc import ABC, abstractmethod
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
+from html.parser import HTMLParser
 from logging import getLogger
 from pathlib import Path
 from typing import Callable, Dict, Generator, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union, cast
 from urllib.parse import ParseResult, urlparse
 from xml.etree.ElementTree import Element
 
-import bs4
 from semantic_version import SimpleSpec as SemanticSimpleSpec
 from semantic_version import Version as SemanticVersion
-from texttable import Texttable
 
 from aqt.exceptions import (
     ArchiveConnectionError,
@@ -112,7 +110,7 @@ class Version(SemanticVersion):
         return super(Version, self).__str__()
 
     @classmethod
-    def permissive(cls, version_string: str):
+    def permissive(cls, version_string: str) -> "Version":
         """Converts a version string with dots (5.X.Y, etc) into a semantic version.
         If the version omits either the patch or minor versions, they will be filled in with zeros,
         and the remaining version string becomes part of the prerelease component.
@@ -137,6 +135,18 @@ class Version(SemanticVersion):
         )
 
 
+@lru_cache(maxsize=4096)
+def _parse_version(version_string: str) -> Version:
+    """Memoized `Version(version_string)`. The returned Version is shared and must not be mutated."""
+    return Version(version_string)
+
+
+@lru_cache(maxsize=4096)
+def _parse_permissive(version_string: str) -> Version:
+    """Memoized `Version.permissive(version_string)`. The returned Version is shared and must not be mutated."""
+    return Version.permissive(version_string)
+
+
 class Versions:
     def __init__(
         self,
@@ -177,6 +187,7 @@ class Versions:
         return [version for row in self for version in row]
 
 
+@lru_cache(maxsize=1024)
 def get_semantic_version(qt_ver: str, is_preview: bool) -> Optional[Version]:
     """Converts a Qt version string (596, 512, 5132, etc) into a semantic version.
     This makes a lot of assumptions based on established patterns:
@@ -187,6 +198,7 @@ def get_semantic_version(qt_ver: str, is_preview: bool) -> Optional[Version]:
     As of May 2021, the version strings at https://download.qt.io/online/qtsdkrepository
     conform to this pattern; they are not guaranteed to do so in the future.
     As of December 2024, it can handle version strings like 6_7_3 as well.
+    Results are memoized, so callers must not mutate the returned Version.
     """
     if not qt_ver:
         return None
@@ -224,19 +236,20 @@ def get_semantic_version(qt_ver: str, is_preview: bool) -> Optional[Version]:
     if not qt_ver.isdigit():
         return None
 
+    major, rest = int(qt_ver[0]), qt_ver[1:]
     if is_preview:
         return Version(
-            major=int(qt_ver[0]),
-            minor=int(qt_ver[1:]),
+            major=major,
+            minor=int(rest),
             patch=0,
             prerelease=("preview",),
         )
-    elif len(qt_ver) >= 4:
-        return Version(major=int(qt_ver[0]), minor=int(qt_ver[1:3]), patch=int(qt_ver[3:]))
-    elif len(qt_ver) == 3:
-        return Version(major=int(qt_ver[0]), minor=int(qt_ver[1]), patch=int(qt_ver[2]))
-    elif len(qt_ver) == 2:
-        return Version(major=int(qt_ver[0]), minor=int(qt_ver[1]), patch=0)
+    elif len(rest) >= 3:
+        return Version(major=major, minor=int(rest[:2]), patch=int(rest[2:]))
+    elif len(rest) == 2:
+        return Version(major=major, minor=int(rest[0]), patch=int(rest[1]))
+    elif len(rest) == 1:
+        return Version(major=major, minor=int(rest), patch=0)
 
     raise ValueError("Invalid version string '{}'".format(qt_ver))
 
@@ -259,6 +272,7 @@ class ArchiveId:
         "src_doc_examples",
         *EXTENSIONS_REQUIRED_ANDROID_QT6,
     }
+    __slots__ = ("category", "host", "target", "_os_arch", "_url", "_folder_cache")
 
     def __init__(self, category: str, host: str, target: str):
         if category not in ArchiveId.CATEGORIES:
@@ -270,6 +284,15 @@ class ArchiveId:
         self.category: str = category
         self.host: str = host
         self.target: str = target
+        # host and target never change after construction, so the url fragments are computed only once
+        if host == "windows":
+            self._os_arch: str = "windows_x86"
+        elif host in ("linux_arm64", "all_os", "windows_arm64"):
+            self._os_arch = host
+        else:
+            self._os_arch = f"{host}_x64"
+        self._url: str = f"online/qtsdkrepository/{self._os_arch}/{target}/"
+        self._folder_cache: Dict[Tuple[Version, str, Optional[str]], str] = {}
 
     def is_preview(self) -> bool:
         return False
@@ -281,16 +304,7 @@ class ArchiveId:
         return self.category == "tools"
 
     def to_os_arch(self) -> str:
-        if self.host == "all_os":
-            return "all_os"
-        return "{os}{arch}".format(
-            os=self.host,
-            arch=(
-                "_x86"
-                if self.host == "windows"
-                else ("" if self.host in ("linux_arm64", "all_os", "windows_arm64") else "_x64")
-            ),
-        )
+        return self._os_arch
 
     def to_extension_folder(self, module, version, arch) -> str:
         extarch = arch
@@ -309,17 +323,19 @@ class ArchiveId:
         )
 
     def to_extension_url(self) -> str:
-        return "online/qtsdkrepository/{osarch}/extensions/".format(
-            osarch=self.to_os_arch(),
-        )
+        return f"online/qtsdkrepository/{self._os_arch}/extensions/"
 
     def to_url(self) -> str:
-        return "online/qtsdkrepository/{osarch}/{target}/".format(
-            osarch=self.to_os_arch(),
-            target=self.target,
-        )
+        return self._url
 
     def to_folder(self, version: Version, qt_version_no_dots: str, extension: Optional[str] = None) -> str:
+        key = (version, qt_version_no_dots, extension)
+        if key not in self._folder_cache:
+            self._folder_cache[key] = self._to_folder(version, qt_version_no_dots, extension)
+        return self._folder_cache[key]
+
+    def _to_folder(self, version: Version, qt_version_no_dots: str, extension: Optional[str]) -> str:
+        major_digit = qt_version_no_dots[0]
         if version >= Version("6.8.0"):
             if self.target == "wasm":
                 # Qt 6.8+ WASM uses a split folder structure
@@ -331,7 +347,7 @@ class ArchiveId:
                 # Non-WASM, non-all_os/qt case
                 return "{category}{major}_{ver}/{category}{major}_{ver}{ext}".format(
                     category=self.category,
-                    major=qt_version_no_dots[0],
+                    major=major_digit,
                     ver=qt_version_no_dots,
                     ext="_" + extension if extension else "",
                 )
@@ -347,7 +363,7 @@ class ArchiveId:
         # Pre-6.8 structure for non-WASM or pre-6.5 structure
         return "{category}{major}_{ver}{ext}".format(
             category=self.category,
-            major=qt_version_no_dots[0],
+            major=major_digit,
             ver=qt_version_no_dots,
             ext="_" + extension if extension else "",
         )
@@ -378,6 +394,9 @@ class TableMetadata(ABC):
     def __init__(self, table_data: Dict[str, Dict[str, str]]):
         self.table_data: Dict[str, Dict[str, str]] = table_data
         self.format_field_for_tty("Description")
+        # Column-wise view of table_data, in row order: built on first use by `_column`
+        self._names: List[str] = sorted(self.table_data.keys())
+        self._columns: Dict[str, List[str]] = {}
 
     def format_field_for_tty(self, field: str):
         for key in self.table_data.keys():
@@ -395,6 +414,10 @@ class TableMetadata(ABC):
     def map_key_to_heading(cls, key: str) -> str:
         return TableMetadata.std_keys_to_headings.get(key, key)
 
+    @classmethod
+    def map_keys_to_headings(cls, keys: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(TableMetadata.map_key_to_heading(key) for key in keys)
+
     @property
     @abstractmethod
     def short_heading_keys(self) -> Iterable[str]: ...
@@ -407,36 +430,50 @@ class TableMetadata(ABC):
     @abstractmethod
     def name_heading(self) -> str: ...
 
+    # Table with a maximum width, ie "120t". The braced form "{:120t}" is only accepted for backward compatibility.
+    WIDTH_FORMAT_PATTERN = re.compile(r"(\d+)t|\{:(\d+)t\}")
+
     def __format__(self, format_spec: str) -> str:
-        short = False
-        if format_spec == "{:s}":
+        if format_spec in ("s", "{:s}"):
             return str(self)
-        if format_spec == "":
-            max_width: int = 0
-        elif format_spec == "{:T}":
-            short = True
-            max_width = 0
+        if format_spec in ("", "T", "{:T}"):
+            short, max_width = format_spec != "", 0
         else:
-            match = re.match(r"\{?:?(\d+)t\}?", format_spec)
-            if match:
-                g = match.groups()
-                max_width = int(g[0])
-            else:
+            match = TableMetadata.WIDTH_FORMAT_PATTERN.fullmatch(format_spec)
+            if not match:
                 raise ValueError("Wrong format {}".format(format_spec))
+            short, max_width = False, int(match.group(1) or match.group(2))
+        # Imported here: only the list-* commands print tables, so other commands skip the import cost
+        from texttable import Texttable
+
         table = Texttable(max_width=max_width)
         table.set_deco(Texttable.HEADER)
 
         heading_keys = self.short_heading_keys if short else self.long_heading_keys
-        heading = [self.name_heading, *[self.map_key_to_heading(key) for key in heading_keys]]
-        table.header(heading)
+        table.header([self.name_heading, *self._headings(short)])
         table.add_rows(self._rows(heading_keys), header=False)
         return cast(str, table.draw())
 
     def __bool__(self):
         return bool(self.table_data)
 
+    # Headings of each subclass, keyed by (subclass, short): the heading keys never change for a subclass
+    _headings_cache: Dict[Tuple[type, bool], Tuple[str, ...]] = {}
+
+    def _headings(self, short: bool) -> Tuple[str, ...]:
+        cache_key = (type(self), short)
+        if cache_key not in TableMetadata._headings_cache:
+            heading_keys = self.short_heading_keys if short else self.long_heading_keys
+            TableMetadata._headings_cache[cache_key] = TableMetadata.map_keys_to_headings(heading_keys)
+        return TableMetadata._headings_cache[cache_key]
+
+    def _column(self, key: str) -> List[str]:
+        if key not in self._columns:
+            self._columns[key] = [self.table_data[name][key] for name in self._names]
+        return self._columns[key]
+
     def _rows(self, keys: Iterable[str]) -> List[List[str]]:
-        return [[name, *[content[key] for key in keys]] for name, content in sorted(self.table_data.items())]
+        return [list(row) for row in zip(self._names, *(self._column(key) for key in keys))]
 
 
 class ToolData(TableMetadata):
@@ -558,8 +595,9 @@ class QtRepoProperty:
     @staticmethod
     def select_default_mingw(mingw_arches: List[str], is_dir: bool) -> Optional[str]:
         """
-        Selects a default architecture from a non-empty list of mingw architectures, matching the pattern
-        MetadataFactory.MINGW_ARCH_PATTERN. Meant to be called on a list of installed mingw architectures,
+        Selects a default architecture from a list of architectures. Entries that do not match
+        QtRepoProperty.MINGW_DIR_PATTERN (if is_dir) or QtRepoProperty.MINGW_ARCH_PATTERN are ignored,
+        and None is returned when no entry matches. Meant to be called on a list of installed architectures,
         or a list of architectures available for installation.
         """
 
@@ -652,6 +690,62 @@ class QtRepoProperty:
             return "src_doc_examples"
 
 
+def _join_url(base: str, rest: str) -> str:
+    """Same as `posixpath.join(base, rest)` for a relative `rest`, without the generic path handling"""
+    return base + rest if base.endswith("/") else f"{base}/{rest}"
+
+
+class _AnchorHrefParser(HTMLParser):
+    """Collects the href attribute of every <a> tag of a directory listing, in document order"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "a":
+            self.hrefs.append(dict(attrs).get("href") or "")
+
+
+def _last_two_dot_fields(name: str) -> Tuple[str, str]:
+    """Same as `name.split(".")[-2:]` for a name with at least one dot, without building the list of parts"""
+    i2 = name.rfind(".")
+    if i2 < 0:
+        raise ValueError(f"Expected at least two dot-separated fields in '{name}'")
+    i1 = name.rfind(".", 0, i2)
+    return name[i1 + 1 : i2], name[i2 + 1 :]
+
+
+@lru_cache(maxsize=64)
+def _qt_version_str(version: Version, is_preview: bool) -> str:
+    # NOTE: The url at `<base>/<host>/<target>/qt5_590/` does not exist; the real one is `qt5_59`
+    patch = "" if version.prerelease or is_preview or version in SimpleSpec("5.9.0") else str(version.patch)
+    return f"{version.major}{version.minor}{patch}"
+
+
+@lru_cache(maxsize=256)
+def _modules_pattern(major: int, qt_ver_str: str) -> re.Pattern[str]:
+    # Example: re.compile(r"^(preview\.)?qt\.(qt5\.)?590\.(.+)$")
+    return re.compile(r"^(preview\.)?qt\.(qt" + str(major) + r"\.)?" + qt_ver_str + r"\.(.+)$")
+
+
+@lru_cache(maxsize=256)
+def _long_modules_pattern(major: int, qt_ver_str: str, arch: str) -> re.Pattern[str]:
+    # Example: re.compile(r"^(preview\.)?qt\.(qt5\.)?590(\.addons)?\.(?P<module>[^.]+)\.gcc_64$")
+    #          qt.qt6.680.addons.qtwebsockets.win64_msvc2022_64
+    #          qt.qt6.680.debug_info.win64_msvc2022_64
+    return re.compile(
+        r"^(preview\.)?qt\.(qt" + str(major) + r"\.)?" + qt_ver_str + r"(\.addons)?\.(?P<module>[^.]+)\." + arch + r"$"
+    )
+
+
+@lru_cache(maxsize=256)
+def _extension_modules_pattern(qt_ver_str: str, arch: str) -> re.Pattern[str]:
+    # Examples: extensions.qtwebengine.680.debug_information
+    #           extensions.qtwebengine.680.win64_msvc2022_64
+    return re.compile(r"^extensions\." + r"(?P<module>[^.]+)\." + qt_ver_str + r"\." + arch + r"$")
+
+
 class MetadataFactory:
     """Retrieve metadata of Qt variations, versions, and descriptions from Qt site."""
 
@@ -661,6 +755,17 @@ class MetadataFactory:
         "SrcDocExamplesQuery", [("cmd_type", str), ("version", Version), ("is_modules_query", bool)]
     )
     ModulesQuery = NamedTuple("ModulesQuery", [("version_str", str), ("arch", str)])
+    # Folder of a version in the repository, ie "qt6_680", "qt5_5152_src_doc_examples" or "qt6_650_wasm_singlethread"
+    VERSION_FOLDER_PATTERN = re.compile(r"^(?:qt|tools)\d*_(?P<ver>\d+)(?:_(?P<ext>.*))?$")
+    # Default desktop arch per host: (first version of the new name or None, new name, older name).
+    # The "windows" entry only applies to MSVC; otherwise the default MinGW arch is looked up online.
+    DEFAULT_DESKTOP_ARCHES: Dict[str, Tuple[Optional[Version], str, str]] = {
+        "linux": (Version("6.7.0"), "linux_gcc_64", "gcc_64"),
+        "linux_arm64": (None, "linux_gcc_arm64", "linux_gcc_arm64"),
+        "mac": (None, "clang_64", "clang_64"),
+        "windows": (Version("6.8.0"), "win64_msvc2022_64", "win64_msvc2019_64"),
+    }
+    __slots__ = ("logger", "archive_id", "spec", "base_url", "_http_cache", "request_type", "_action")
 
     def __init__(
         self,
@@ -693,6 +798,8 @@ class MetadataFactory:
         self.archive_id = archive_id
         self.spec = spec
         self.base_url = base_url or Settings.baseurl
+        # Documents already retrieved by fetch_http, keyed by (rest_of_url, is_check_hash)
+        self._http_cache: Dict[Tuple[str, bool], str] = {}
 
         if archive_id.is_tools():
             if tool_name is not None:
@@ -780,9 +887,12 @@ class MetadataFactory:
         versions_extensions = self.get_versions_extensions(
             self.fetch_http(self.archive_id.to_url(), False), self.archive_id.category
         )
-        versions = sorted([ver for ver, ext in versions_extensions if ver is not None and filter_by(ver, ext)])
-        grouped = cast(Iterable[Tuple[int, Iterable[Version]]], itertools.groupby(versions, lambda version: version.minor))
-        return Versions(grouped)
+        # Bucket versions by (major, minor), so that only versions within one bucket need to be compared
+        buckets: Dict[Tuple[int, int], List[Version]] = {}
+        for ver, ext in versions_extensions:
+            if ver is not None and filter_by(ver, ext):
+                buckets.setdefault((ver.major, ver.minor), []).append(ver)
+        return Versions((minor, sorted(buckets[(major, minor)])) for major, minor in sorted(buckets))
 
     def fetch_latest_version(self, ext: str) -> Optional[Version]:
         return self.fetch_versions(ext).latest()
@@ -811,24 +921,20 @@ class MetadataFactory:
     def choose_highest_version_in_spec(
         all_tools_data: Dict[str, Dict[str, str]], simple_spec: SimpleSpec
     ) -> Optional[Dict[str, str]]:
-        # Get versions of all modules. Fail if version cannot be determined.
-        try:
-            tools_versions = [
-                (name, tool_data, Version.permissive(tool_data["Version"])) for name, tool_data in all_tools_data.items()
-            ]
-        except ValueError:
-            return None
-
-        # Remove items that don't conform to simple_spec
-        tools_versions = [tool_item for tool_item in tools_versions if tool_item[2] in simple_spec]
-
-        try:
-            # Return the conforming item with the highest version.
+        best_version: Optional[Version] = None
+        best_tool_data: Optional[Dict[str, str]] = None
+        for tool_data in all_tools_data.values():
+            # Fail if the version of any module cannot be determined.
+            try:
+                version = _parse_permissive(tool_data["Version"])
+            except ValueError:
+                return None
+            # Keep the conforming item with the highest version.
             # If there are multiple items with the same version, the result will not be predictable.
-            return max(tools_versions, key=operator.itemgetter(2))[1]
-        except ValueError:
-            # There were no tools that fit the simple_spec
-            return None
+            if version in simple_spec and (best_version is None or version > best_version):
+                best_version, best_tool_data = version, tool_data
+        # None if there were no tools that fit the simple_spec
+        return best_tool_data
 
     def _to_version(self, qt_ver: str, arch: Optional[str]) -> Version:
         """
@@ -850,34 +956,31 @@ class MetadataFactory:
                 raise CliInputError(msg)
             return latest_version
         try:
-            version = Version(qt_ver)
+            version = _parse_version(qt_ver)
         except ValueError as e:
             raise CliInputError(e) from e
         return version
 
     def fetch_http(self, rest_of_url: str, is_check_hash: bool = True) -> str:
+        cache_key = (rest_of_url, is_check_hash)
+        if cache_key in self._http_cache:
+            return self._http_cache[cache_key]
         timeout = (Settings.connection_timeout, Settings.response_timeout)
         expected_hash = get_hash(rest_of_url, Settings.hash_algorithm, timeout) if is_check_hash else None
-        base_urls = self.base_url, random.choice(Settings.fallbacks)
-
-        err: BaseException = AssertionError("unraisable")
-
-        for i, base_url in enumerate(base_urls):
-            try:
-                url = posixpath.join(base_url, rest_of_url)
-                return getUrl(url=url, timeout=timeout, expected_hash=expected_hash)
-
-            except (ArchiveDownloadError, ArchiveConnectionError) as e:
-                err = e
-                if i < len(base_urls) - 1:
-                    getLogger("aqt.metadata").debug(
-                        f"Connection to '{base_url}' failed. Retrying with fallback '{base_urls[i + 1]}'."
-                    )
-        raise err from err
+        try:
+            result = getUrl(url=_join_url(self.base_url, rest_of_url), timeout=timeout, expected_hash=expected_hash)
+        except (ArchiveDownloadError, ArchiveConnectionError):
+            # A fallback mirror is only drawn once the primary base url has failed
+            fallback_url = random.choice(Settings.fallbacks)
+            getLogger("aqt.metadata").debug(
+                f"Connection to '{self.base_url}' failed. Retrying with fallback '{fallback_url}'."
+            )
+            result = getUrl(url=_join_url(fallback_url, rest_of_url), timeout=timeout, expected_hash=expected_hash)
+        self._http_cache[cache_key] = result
+        return result
 
     def iterate_folders(self, html_doc: str, html_url: str, *, filter_category: str = "") -> Generator[str, None, None]:
-        def link_to_folder(link: bs4.element.Tag) -> str:
-            raw_url: str = str(link.get("href", default=""))
+        def link_to_folder(raw_url: str) -> str:
             url: ParseResult = urlparse(raw_url)
             if url.scheme or url.netloc:
                 return ""
@@ -887,9 +990,11 @@ class MetadataFactory:
             return url_path
 
         try:
-            soup: bs4.BeautifulSoup = bs4.BeautifulSoup(html_doc, "html.parser")
-            for link in soup.find_all("a"):
-                folder: str = link_to_folder(link)
+            parser = _AnchorHrefParser()
+            parser.feed(html_doc)
+            parser.close()
+            for href in parser.hrefs:
+                folder: str = link_to_folder(href)
                 if not folder:
                     continue
                 if folder.startswith(filter_category):
@@ -907,11 +1012,12 @@ class MetadataFactory:
 
     def get_versions_extensions(self, html_doc: str, category: str) -> Iterator[Tuple[Optional[Version], str]]:
         def folder_to_version_extension(folder: str) -> Tuple[Optional[Version], str]:
-            components = folder.split("_", maxsplit=2)
-            ext = "" if len(components) < 3 else components[2]
-            ver = "" if len(components) < 2 else components[1]
+            match = MetadataFactory.VERSION_FOLDER_PATTERN.match(folder)
+            if not match:
+                return None, ""
+            ver, ext = match.group("ver"), match.group("ext") or ""
             return (
-                get_semantic_version(qt_ver=ver, is_preview="preview" in ext),
+                get_semantic_version(ver, "preview" in ext),
                 ext,
             )
 
@@ -932,16 +1038,10 @@ class MetadataFactory:
 
     def _get_qt_version_str(self, version: Version) -> str:
         """Returns a Qt version, without dots, that works in the Qt repo urls and Updates.xml files"""
-        # NOTE: The url at `<base>/<host>/<target>/qt5_590/` does not exist; the real one is `qt5_59`
-        patch = (
-            ""
-            if version.prerelease or self.archive_id.is_preview() or version in SimpleSpec("5.9.0")
-            else str(version.patch)
-        )
-        return f"{version.major}{version.minor}{patch}"
+        return _qt_version_str(version, self.archive_id.is_preview())
 
     def _fetch_module_metadata(self, folder: str, predicate: Optional[Callable[[Element], bool]] = None):
-        rest_of_url = posixpath.join(self.archive_id.to_url(), folder, "Updates.xml")
+        rest_of_url = _join_url(_join_url(self.archive_id.to_url(), folder), "Updates.xml")
         xml = self.fetch_http(rest_of_url) if not Settings.ignore_hash else self.fetch_http(rest_of_url, False)
         return xml_to_modules(
             xml,
@@ -949,19 +1049,42 @@ class MetadataFactory:
         )
 
     def _fetch_extension_metadata(self, url: str, predicate: Optional[Callable[[Element], bool]] = None):
-        rest_of_url = posixpath.join(url, "Updates.xml")
+        rest_of_url = _join_url(url, "Updates.xml")
         xml = self.fetch_http(rest_of_url) if not Settings.ignore_hash else self.fetch_http(rest_of_url, False)
         return xml_to_modules(
             xml,
             predicate=predicate if predicate else MetadataFactory._has_nonempty_downloads,
         )
 
+    def _fetch_known_extensions_metadata(
+        self, version: Version, qt_ver_str: str, arch: str
+    ) -> List[Tuple[str, Dict[str, Dict[str, str]]]]:
+        """
+        Fetches the metadata of every known extension for this version of Qt concurrently.
+        Returns (extension, metadata) pairs in the order of `QtRepoProperty.known_extensions`,
+        leaving out extensions that do not exist for this version and arch.
+        """
+        extensions = QtRepoProperty.known_extensions(version)
+        if not extensions:
+            return []
+        results: List[Tuple[str, Dict[str, Dict[str, str]]]] = []
+        with ThreadPoolExecutor(max_workers=len(extensions)) as executor:
+            futures = [
+                executor.submit(self._fetch_extension_metadata, self.archive_id.to_extension_folder(ext, qt_ver_str, arch))
+                for ext in extensions
+            ]
+            for ext, future in zip(extensions, futures):
+                try:
+                    results.append((ext, future.result()))
+                except (ChecksumDownloadFailure, ArchiveDownloadError):
+                    pass
+        return results
+
     def fetch_modules(self, version: Version, arch: str) -> List[str]:
         """Returns list of modules"""
         extension = QtRepoProperty.extension_for_arch(arch, version >= Version("6.0.0"))
         qt_ver_str = self._get_qt_version_str(version)
-        # Example: re.compile(r"^(preview\.)?qt\.(qt5\.)?590\.(.+)$")
-        pattern = re.compile(r"^(preview\.)?qt\.(qt" + str(version.major) + r"\.)?" + qt_ver_str + r"\.(.+)$")
+        pattern = _modules_pattern(version.major, qt_ver_str)
         modules_meta = self._fetch_module_metadata(self.archive_id.to_folder(version, qt_ver_str, extension))
 
         def to_module_arch(name: str) -> Tuple[Optional[str], Optional[str]]:
@@ -982,18 +1105,14 @@ class MetadataFactory:
             if _arch == arch:
                 modules.add(cast(str, module))
 
-        ext_pattern = re.compile(r"^extensions\." + r"(?P<module>[^.]+)\." + qt_ver_str + r"\." + arch + r"$")
-        for ext in QtRepoProperty.known_extensions(version):
-            try:
-                ext_meta = self._fetch_extension_metadata(self.archive_id.to_extension_folder(ext, qt_ver_str, arch))
-                for key, value in ext_meta.items():
-                    ext_match = ext_pattern.match(key)
-                    if ext_match is not None:
-                        module = ext_match.group("module")
-                        if module is not None:
-                            modules.add(ext)
-            except (ChecksumDownloadFailure, ArchiveDownloadError):
-                pass
+        ext_pattern = _extension_modules_pattern(qt_ver_str, arch)
+        for ext, ext_meta in self._fetch_known_extensions_metadata(version, qt_ver_str, arch):
+            for key, value in ext_meta.items():
+                ext_match = ext_pattern.match(key)
+                if ext_match is not None:
+                    module = ext_match.group("module")
+                    if module is not None:
+                        modules.add(ext)
         return sorted(modules)
 
     @staticmethod
@@ -1007,18 +1126,7 @@ class MetadataFactory:
         """Returns long listing of modules"""
         extension = QtRepoProperty.extension_for_arch(arch, version >= Version("6.0.0"))
         qt_ver_str = self._get_qt_version_str(version)
-        # Example: re.compile(r"^(preview\.)?qt\.(qt5\.)?590(\.addons)?\.(?P<module>[^.]+)\.gcc_64$")
-        #          qt.qt6.680.addons.qtwebsockets.win64_msvc2022_64
-        #          qt.qt6.680.debug_info.win64_msvc2022_64
-        pattern = re.compile(
-            r"^(preview\.)?qt\.(qt"
-            + str(version.major)
-            + r"\.)?"
-            + qt_ver_str
-            + r"(\.addons)?\.(?P<module>[^.]+)\."
-            + arch
-            + r"$"
-        )
+        pattern = _long_modules_pattern(version.major, qt_ver_str, arch)
 
         def matches_arch(element: Element) -> bool:
             return bool(pattern.match(MetadataFactory.require_text(element, "Name")))
@@ -1032,20 +1140,14 @@ class MetadataFactory:
                 if module is not None:
                     m[module] = value
 
-        # Examples: extensions.qtwebengine.680.debug_information
-        #           extensions.qtwebengine.680.win64_msvc2022_64
-        ext_pattern = re.compile(r"^extensions\." + r"(?P<module>[^.]+)\." + qt_ver_str + r"\." + arch + r"$")
-        for ext in QtRepoProperty.known_extensions(version):
-            try:
-                ext_meta = self._fetch_extension_metadata(self.archive_id.to_extension_folder(ext, qt_ver_str, arch))
-                for key, value in ext_meta.items():
-                    ext_match = ext_pattern.match(key)
-                    if ext_match is not None:
-                        module = ext_match.group("module")
-                        if module is not None:
-                            m[module] = value
-            except (ChecksumDownloadFailure, ArchiveDownloadError):
-                pass
+        ext_pattern = _extension_modules_pattern(qt_ver_str, arch)
+        for _, ext_meta in self._fetch_known_extensions_metadata(version, qt_ver_str, arch):
+            for key, value in ext_meta.items():
+                ext_match = ext_pattern.match(key)
+                if ext_match is not None:
+                    module = ext_match.group("module")
+                    if module is not None:
+                        m[module] = value
         return ModuleData(m)
 
     def fetch_modules_sde(self, cmd_type: str, version: Version) -> List[str]:
@@ -1058,14 +1160,15 @@ class MetadataFactory:
         modules_meta = self._fetch_module_metadata(
             self.archive_id.to_folder(version, qt_ver_str, QtRepoProperty.sde_ext(version))
         )
-        # pattern: Match all names "qt.qt5.12345.doc.(\w+)
-        pattern = re.compile(r"^qt\.(qt" + str(version.major) + r"\.)?" + qt_ver_str + r"\." + cmd_type + r"\.(.+)$")
+        # Match all names "qt.qt5.12345.doc.(.+)" or "qt.12345.doc.(.+)"
+        prefixes = (f"qt.qt{version.major}.{qt_ver_str}.{cmd_type}.", f"qt.{qt_ver_str}.{cmd_type}.")
 
         modules: List[str] = []
         for name in modules_meta:
-            _match = pattern.match(name)
-            if _match:
-                modules.append(_match.group(2))
+            for prefix in prefixes:
+                if len(name) > len(prefix) and name.startswith(prefix):
+                    modules.append(name[len(prefix) :])
+                    break
         return modules
 
     def fetch_archives_sde(self, cmd_type: str, version: Version) -> List[str]:
@@ -1084,18 +1187,23 @@ class MetadataFactory:
         )
         qt_version_str = self._get_qt_version_str(version)
         nonempty = MetadataFactory._has_nonempty_downloads
+        require_text = MetadataFactory.require_text
 
         def all_modules(element: Element) -> bool:
-            _module, _arch = MetadataFactory.require_text(element, "Name").split(".")[-2:]
+            _module, _arch = _last_two_dot_fields(require_text(element, "Name"))
             return _arch == arch and _module != qt_version_str and nonempty(element)
 
+        modules_set = frozenset(modules)
+
         def specify_modules(element: Element) -> bool:
-            _module, _arch = MetadataFactory.require_text(element, "Name").split(".")[-2:]
-            return _arch == arch and _module in modules and nonempty(element)
+            _module, _arch = _last_two_dot_fields(require_text(element, "Name"))
+            return _arch == arch and _module in modules_set and nonempty(element)
+
+        no_modules_suffix = f".{qt_version_str}.{arch}"
 
         def no_modules(element: Element) -> bool:
             name: Optional[str] = getattr(element.find("Name"), "text", None)
-            return name is not None and name.endswith(f".{qt_version_str}.{arch}") and nonempty(element)
+            return name is not None and name.endswith(no_modules_suffix) and nonempty(element)
 
         predicate = no_modules if not modules else all_modules if "all" in modules else specify_modules
         try:
@@ -1107,16 +1215,16 @@ class MetadataFactory:
 
         # Did we find all requested modules?
         if modules and "all" not in modules:
-            requested_set = set(modules)
-            actual_set = set([_name.split(".")[-2] for _name in mod_metadata.keys()])
-            not_found = sorted(requested_set.difference(actual_set))
+            actual_set = {_last_two_dot_fields(_name)[0] for _name in mod_metadata}
+            not_found = sorted(modules_set.difference(actual_set))
             if not_found:
                 raise CliInputError(
                     f"The requested modules were not located: {not_found}", suggested_action=suggested_follow_up(self)
                 )
 
-        csv_lists = [mod["DownloadableArchives"] for mod in mod_metadata.values()]
-        return sorted(set([arc.split("-")[0] for csv in csv_lists for arc in csv.split(", ")]))
+        return sorted(
+            {arc.partition("-")[0] for mod in mod_metadata.values() for arc in mod["DownloadableArchives"].split(", ")}
+        )
 
     def describe_filters(self) -> str:
         if self.spec is None:
@@ -1125,22 +1233,13 @@ class MetadataFactory:
 
     def fetch_default_desktop_arch(self, version: Version, is_msvc: bool = False) -> str:
         assert self.archive_id.target == "desktop", "This function is meant to fetch desktop architectures"
-        if self.archive_id.host == "linux":
-            if version >= Version("6.7.0"):
-                return "linux_gcc_64"
-            else:
-                return "gcc_64"
-        elif self.archive_id.host == "linux_arm64":
-            return "linux_gcc_arm64"
-        elif self.archive_id.host == "mac":
-            return "clang_64"
-        elif self.archive_id.host == "windows" and is_msvc:
-            if version >= Version("6.8.0"):
-                return "win64_msvc2022_64"
-            else:
-                return "win64_msvc2019_64"
-        arches = [arch for arch in self.fetch_arches(version) if QtRepoProperty.MINGW_ARCH_PATTERN.match(arch)]
-        selected_arch = QtRepoProperty.select_default_mingw(arches, is_dir=False)
+        host = self.archive_id.host
+        default_arch = MetadataFactory.DEFAULT_DESKTOP_ARCHES.get(host) if host != "windows" or is_msvc else None
+        if default_arch is not None:
+            min_version, arch, older_arch = default_arch
+            return arch if min_version is None or version >= min_version else older_arch
+        # select_default_mingw skips every arch that does not match MINGW_ARCH_PATTERN
+        selected_arch = QtRepoProperty.select_default_mingw(self.fetch_arches(version), is_dir=False)
         if not selected_arch:
             raise EmptyMetadata("No default desktop architecture available")
         return selected_arch
@@ -1150,9 +1249,7 @@ def suggested_follow_up(meta: MetadataFactory) -> List[str]:
     """Makes an informed guess at what the user got wrong, in the event of an error."""
     msg = []
     list_cmd = "list-tool" if meta.archive_id.is_tools() else "list-qt"
-    base_cmd = "aqt {0} {1.host} {1.target}".format(list_cmd, meta.archive_id)
-    versions_msg = f"Please use '{base_cmd}' to show versions of Qt available."
-    arches_msg = f"Please use '{base_cmd} --arch <QT_VERSION>' to show architectures available."
+    base_cmd = f"aqt {list_cmd} {meta.archive_id.host} {meta.archive_id.target}"
 
     if meta.archive_id.is_tools() and meta.request_type == "tool variant names":
         msg.append(f"Please use '{base_cmd}' to check what tools are available.")
@@ -1165,10 +1262,11 @@ def suggested_follow_up(meta: MetadataFactory) -> List[str]:
         msg.append(f"Please use '{base_cmd}' to show versions of Qt available.")
         if meta.request_type == "modules":
             msg.append(f"Please use '{base_cmd} --arch <QT_VERSION>' to list valid architectures.")
-    elif meta.request_type == "archives for modules":
-        msg.extend([versions_msg, arches_msg, f"Please use '{base_cmd} --modules <QT_VERSION>' to show modules available."])
-    elif meta.request_type == "archives for qt":
-        msg.extend([versions_msg, arches_msg])
+    elif meta.request_type in ("archives for modules", "archives for qt"):
+        msg.append(f"Please use '{base_cmd}' to show versions of Qt available.")
+        msg.append(f"Please use '{base_cmd} --arch <QT_VERSION>' to show architectures available.")
+        if meta.request_type == "archives for modules":
+            msg.append(f"Please use '{base_cmd} --modules <QT_VERSION>' to show modules available.")
 
     return msg
 
@@ -1185,11 +1283,12 @@ def show_list(meta: MetadataFactory):
         elif isinstance(output, TableMetadata):
             width: int = shutil.get_terminal_size((0, 40)).columns
             if width == 0:  # notty ?
-                print(format(output, "{:0t}"))
+                table_format = "0t"
             elif width < 95:  # narrow terminal
-                print(format(output, "{:T}"))
+                table_format = "T"
             else:
-                print("{0:{1}t}".format(output, width))
+                table_format = f"{width}t"
+            print(format(output, table_format))
         elif meta.archive_id.is_tools():
             print(*output, sep="\n")
         else:
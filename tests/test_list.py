@@ -26,6 +26,7 @@ from aqt.metadata import (
     MetadataFactory,
     QtRepoProperty,
     SimpleSpec,
+    TableMetadata,
     ToolData,
     Version,
     Versions,
@@ -177,6 +178,20 @@ def test_list_versions_tools(monkeypatch, spec_regex, os_name, target, in_file,
         assert f"{all_ver_for_spec}" == row
 
 
+@pytest.mark.parametrize(
+    "html_doc, expected",
+    (
+        ('<a data-href="qt6_680/" href="qt6_670/">qt6_670/</a>', ["qt6_670"]),
+        ('<!-- <a href="qt6_680/">qt6_680/</a> --><a href="qt6_670/">qt6_670/</a>', ["qt6_670"]),
+        ('<a title="a>b" href="qt6_670/">qt6_670/</a>', ["qt6_670"]),
+        ("<A HREF='qt6_670/'>qt6_670/</A><a href=qt6_680/>qt6_680/</a>", ["qt6_670", "qt6_680"]),
+    ),
+)
+def test_iterate_folders_reads_only_anchor_hrefs(html_doc: str, expected: List[str]):
+    meta = MetadataFactory(ArchiveId("qt", "windows", "desktop"))
+    assert list(meta.iterate_folders(html_doc, "some_url", filter_category="qt")) == expected
+
+
 @pytest.mark.parametrize(
     "version,extension,in_file,expect_out_file",
     [
@@ -203,6 +218,32 @@ def test_list_qt_modules(monkeypatch, version: str, extension: str, in_file: str
         assert modules == sorted(expect["modules_by_arch"][arch])
 
 
+def test_list_qt_modules_with_extensions(monkeypatch):
+    archive_id = ArchiveId("qt", "linux", "desktop")
+    _xml = (Path(__file__).parent / "data" / "linux-680-desktop-update.xml").read_text("utf-8")
+    _ext_xml = (
+        "<Updates><PackageUpdate>"
+        "<Name>extensions.qtwebengine.680.linux_gcc_64</Name>"
+        "<DownloadableArchives>qtwebengine.7z</DownloadableArchives>"
+        '<UpdateFile CompressedSize="1000" UncompressedSize="2000"/>'
+        "</PackageUpdate></Updates>"
+    )
+
+    def _mock_fetch_http(self, rest_of_url: str, is_check_hash: bool = True) -> str:
+        if "/extensions/qtpdf/" in rest_of_url:
+            raise ArchiveDownloadError("qtpdf does not exist")
+        if "/extensions/qtwebengine/" in rest_of_url:
+            return _ext_xml
+        return _xml
+
+    monkeypatch.setattr(MetadataFactory, "fetch_http", _mock_fetch_http)
+
+    modules = MetadataFactory(archive_id).fetch_modules(Version("6.8.0"), "linux_gcc_64")
+    assert "qtwebengine" in modules
+    assert "qtpdf" not in modules
+    assert "qtcharts" in modules
+
+
 @pytest.fixture
 def win_5152_sde_xml_file() -> str:
     return (Path(__file__).parent / "data" / "windows-5152-src-doc-example-update.xml").read_text("utf-8")
@@ -1109,6 +1150,30 @@ def fetch_expected_tooldata(json_filename: str) -> ToolData:
     return ToolData(tools)
 
 
+def test_tooldata_format_spec():
+    tooldata = fetch_expected_tooldata("mac-desktop-tools_ifw-expect.json")
+    assert format(tooldata, "s") == format(tooldata, "{:s}") == str(tooldata)
+    assert format(tooldata, "T") == format(tooldata, "{:T}")
+    assert format(tooldata, "80t") == format(tooldata, "{:80t}")
+    assert "Description" in format(tooldata, "") and "Description" not in format(tooldata, "T")
+    with pytest.raises(ValueError, match="Wrong format x"):
+        format(tooldata, "x")
+    with pytest.raises(ValueError, match="Wrong format 80tfoo"):
+        format(tooldata, "80tfoo")
+    with pytest.raises(ValueError, match="Wrong format 80t}"):
+        format(tooldata, "80t}")
+
+
+def test_table_metadata_subclass_headings():
+    class StubData(TableMetadata):
+        short_heading_keys = ("DisplayName",)
+        long_heading_keys = ("DisplayName", "ReleaseDate")
+        name_heading = "Stub Name"
+
+    stub = StubData({"stub": {"DisplayName": "Stub", "ReleaseDate": "2024-01-01"}})
+    assert "Release Date" in format(stub, "") and "Release Date" not in format(stub, "T")
+
+
 @pytest.mark.parametrize(
     "host, target, tool_name",
     (
@@ -1181,6 +1246,24 @@ def test_fetch_http_ok(monkeypatch):
     assert MetadataFactory(mac_qt, base_url=base_url).fetch_http("some_url") == str(html_content)
 
 
+def test_fetch_http_cached(monkeypatch):
+    urls_requested = []
+
+    def _mock(url, **kwargs):
+        urls_requested.append(url)
+        return "some_html_content"
+
+    monkeypatch.setattr("aqt.metadata.get_hash", lambda *args, **kwargs: hashlib.sha256(b"some_html_content").hexdigest())
+    monkeypatch.setattr("aqt.metadata.getUrl", _mock)
+
+    meta = MetadataFactory(mac_qt)
+    assert meta.fetch_http("some_url") == "some_html_content"
+    assert meta.fetch_http("some_url") == "some_html_content"
+    assert len(urls_requested) == 1
+    assert meta.fetch_http("other_url") == "some_html_content"
+    assert len(urls_requested) == 2
+
+
 def test_fetch_http_failover(monkeypatch):
     urls_requested = set()
 
@@ -1244,6 +1327,23 @@ def test_select_default_mingw(monkeypatch, host: str, expected: Union[str, Excep
         assert actual_arch == expected
 
 
+@pytest.mark.parametrize(
+    "host, version, is_msvc, expected",
+    (
+        ("linux", "6.6.3", False, "gcc_64"),
+        ("linux", "6.7.0", False, "linux_gcc_64"),
+        ("linux_arm64", "6.7.0", False, "linux_gcc_arm64"),
+        ("mac", "6.8.0", True, "clang_64"),
+        ("windows", "6.7.3", True, "win64_msvc2019_64"),
+        ("windows", "6.8.0", True, "win64_msvc2022_64"),
+    ),
+)
+def test_default_desktop_arch_without_fetching(monkeypatch, host: str, version: str, is_msvc: bool, expected: str):
+    monkeypatch.setattr("aqt.metadata.MetadataFactory.fetch_arches", lambda *args, **kwargs: ["should not fetch arches"])
+    meta = MetadataFactory(ArchiveId("qt", host, "desktop"))
+    assert meta.fetch_default_desktop_arch(Version(version), is_msvc=is_msvc) == expected
+
+
 @pytest.mark.parametrize(
     "expected_result, installed_files",
     (
@@ -57,3 +57,10 @@ def test_get_semantic_version_raises_value_error():
     """
     with pytest.raises(ValueError, match="Invalid version string '1'"):
         get_semantic_version("1", False)
+
+
+def test_get_semantic_version_is_cached():
+    get_semantic_version.cache_clear()
+    first = get_semantic_version("6_7_3", False)
+    assert get_semantic_version("6_7_3", False) is first
+    assert get_semantic_version.cache_info().hits == 1